@@ -1,4 +1,8 @@
+import secrets
 from datetime import datetime, timedelta
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import jwt
 from passlib.context import CryptContext
 
@@ -24,3 +28,14 @@ def create_access_token(data: dict) -> str:
         settings.SECRET_KEY,
         algorithm=settings.ALGORITHM
     )
+
+
+admin_bearer = HTTPBearer(auto_error=False)
+
+def require_admin(credentials: HTTPAuthorizationCredentials = Depends(admin_bearer)):
+    # Без ADMIN_TOKEN административные эндпоинты отключены
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Администрирование отключено")
+    if not credentials or not secrets.compare_digest(credentials.credentials, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Неверный токен администратора",
+                            headers={"WWW-Authenticate": "Bearer"})
@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from sqlmodel import Session, select
 
+from db.writer import commit_unit
 from models.models import User
 from auth.security import hash_password, verify_password, create_access_token
 
@@ -9,20 +10,25 @@ class AuthService:
 
     @staticmethod
     def register(data, session: Session):
-        existing = session.exec(select(User).where(User.email == data.email)).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Email уже зарегистрирован")
-
-        user = User(
-            name=data.name,
-            email=data.email,
-            password_hash=hash_password(data.password)
-        )
-        session.add(user)
-        session.commit()
-        session.refresh(user)
+        # Хэширование выполняется до коммита, чтобы не занимать им общий поток записи
+        password_hash = hash_password(data.password)
 
-        return create_access_token({"sub": str(user.id)})
+        def create_user(db: Session):
+            existing = db.exec(select(User).where(User.email == data.email)).first()
+            if existing:
+                raise HTTPException(status_code=400, detail="Email уже зарегистрирован")
+
+            user = User(
+                name=data.name,
+                email=data.email,
+                password_hash=password_hash
+            )
+            db.add(user)
+            db.flush()
+
+            return create_access_token({"sub": str(user.id)})
+
+        return commit_unit(create_user, session)
 
     @staticmethod
     def login(data, session: Session):
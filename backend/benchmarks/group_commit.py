@@ -0,0 +1,86 @@
+# Сравнение пропускной способности и задержки add_order: отдельный коммит на запрос
+# против общего писателя с групповым коммитом.
+#
+# Запуск из каталога backend:  python -m benchmarks.group_commit [--requests 2000] [--threads 32]
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from db.writer import GroupCommitWriter, create_writer_engine
+from models.models import Game, Genre, Platform, User
+from models.schemas import OrderAdd
+from routers.orders import place_order
+
+
+def seed(url : str, users : int):
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Genre(id=1, name="genre"))
+        db.add(Platform(id=1, name="platform"))
+        db.add(Game(id=1, genre_id=1, platform_id=1, title="game", description="", price=100,
+                    release_date=date.today(), developer="dev"))
+        db.add_all([User(id=i, name=f"user{i}", email=f"user{i}@example.com", password_hash="") for i in range(1, users + 1)])
+        db.commit()
+    return engine
+
+
+def per_request(engine):
+    def call(user_id):
+        with Session(engine) as db:
+            place_order(OrderAdd(user_id=user_id, game_id=1), db)
+            db.commit()
+    return call
+
+
+def group_commit(writer):
+    def call(user_id):
+        writer.submit(lambda db: place_order(OrderAdd(user_id=user_id, game_id=1), db))
+    return call
+
+
+def run(name : str, call, requests : int, threads : int):
+    latencies = []
+
+    def timed(user_id):
+        started = time.perf_counter()
+        call(user_id)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(timed, range(1, requests + 1)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{name:>14}: {requests / elapsed:8.0f} req/s  "
+          f"p50 {statistics.median(latencies) * 1000:6.2f} ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--window-ms", type=float, default=2)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'per_request.db')}"
+        run("per-request", per_request(seed(url, args.requests)), args.requests, args.threads)
+
+        url = f"sqlite:///{os.path.join(tmp, 'group_commit.db')}"
+        seed(url, args.requests)
+        writer = GroupCommitWriter(create_writer_engine(url), args.window_ms, args.max_batch)
+        run("group-commit", group_commit(writer), args.requests, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+from cache.versions import versions
+
+PUBLIC = "public, no-cache"
+PRIVATE = "private, no-cache"
+
+
+def make_etag(tables, key=None) -> str:
+    # Строгий ETag из версий таблиц: вычисляется без обращения к БД
+    stamp = versions.stamp(tables, key)
+    parts = [f"{versions.epoch:x}"] + ["-".join(map(str, v)) if isinstance(v, tuple) else str(v) for v in stamp]
+    return '"' + ".".join(parts) + '"'
+
+
+def check_not_modified(request : Request, response : Response, etag : str, cache_control : str) -> Optional[Response]:
+    # Возвращает готовый ответ 304, если клиент прислал актуальный ETag,
+    # иначе проставляет заголовки в основной ответ
+    headers = {"ETag" : etag, "Cache-Control" : cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,115 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка только внутри процесса
+    fcntl = None
+
+
+# "profiler" - не таблица, а поколение настроек профилировщика (profiling/sampler.py)
+TABLES = ("user", "game", "genre", "platform", "order", "review", "library", "profiler")
+PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "table_versions.bin")
+
+# Число ячеек для версий по ключу (например, по пользователю). Коллизия ключей
+# приводит лишь к лишней инвалидации, но не к устаревшим данным
+KEY_BUCKETS = 4096
+
+SLOT = struct.Struct("<Q")
+
+
+class TableVersions:
+    # Счетчики версий таблиц в общем для всех воркеров файле, отображенном в память (mmap).
+    # Роутеры увеличивают счетчик после коммита, а чтение - это просто чтение из памяти,
+    # без обращения к БД.
+    #
+    # Раскладка файла: [epoch] [version, reset] * таблицы [bucket] * KEY_BUCKETS
+    # epoch - случайное число, которое меняется при пересоздании файла;
+    # version - любое изменение таблицы;
+    # reset - изменение, затронувшее заранее неизвестные ключи (каскадное удаление и т.п.);
+    # bucket - изменения строк конкретного ключа таблицы
+    def __init__(self, path : str = PATH, tables : tuple = TABLES, key_buckets : int = KEY_BUCKETS):
+        self.slots = {name : i for i, name in enumerate(tables)}
+        self.key_buckets = key_buckets
+        self._buckets_start = 1 + 2 * len(tables)
+        self._lock = threading.Lock()
+        size = SLOT.size * (self._buckets_start + key_buckets)
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._locked():
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, SLOT.pack(int.from_bytes(os.urandom(SLOT.size), "little")), 0)
+        self._map = mmap.mmap(self._fd, size)
+        self.epoch = self._read(0)
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read(self, slot : int) -> int:
+        return SLOT.unpack_from(self._map, slot * SLOT.size)[0]
+
+    def _increment(self, slot : int):
+        SLOT.pack_into(self._map, slot * SLOT.size, self._read(slot) + 1)
+
+    def _bucket(self, table : str, key) -> int:
+        return self._buckets_start + zlib.crc32(f"{table}:{key}".encode()) % self.key_buckets
+
+    def get(self, table : str) -> int:
+        return self._read(1 + 2 * self.slots[table])
+
+    def get_key(self, table : str, key) -> tuple:
+        return self._read(2 + 2 * self.slots[table]), self._read(self._bucket(table, key))
+
+    def stamp(self, tables, key=None) -> tuple:
+        if key is None:
+            return tuple(self.get(table) for table in tables)
+        return tuple(self.get_key(table, key) for table in tables)
+
+    def bump(self, *tables : str, key=None):
+        # Без key изменение считается затронувшим все ключи таблицы
+        with self._locked():
+            for table in tables:
+                slot = 1 + 2 * self.slots[table]
+                self._increment(slot)
+                if key is None:
+                    self._increment(slot + 1)
+                else:
+                    self._increment(self._bucket(table, key))
+
+
+class VersionedCache:
+    # Кэш внутри процесса: значение считается актуальным, пока не изменились версии
+    # таблиц, из которых оно было построено
+    def __init__(self, table_versions : TableVersions):
+        self.versions = table_versions
+        self._entries = {}
+
+    def get(self, key : str, tables, loader):
+        # Версии читаются до загрузки: если запись произойдет во время загрузки,
+        # следующий запрос увидит новую версию и перечитает данные
+        stamp = self.versions.stamp(tables)
+        entry = self._entries.get(key)
+        if entry and entry[0] == stamp:
+            return entry[1]
+
+        value = loader()
+        self._entries[key] = (stamp, value)
+        return value
+
+
+versions = TableVersions()
+cache = VersionedCache(versions)
@@ -1,9 +1,17 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     ALGORITHM: str = "HS256"
+    BATCH_MAX_IDS: int = 100
+    GROUP_COMMIT: bool = False
+    GROUP_COMMIT_WINDOW_MS: float = 2
+    GROUP_COMMIT_MAX_BATCH: int = 64
+    PROFILER_BUFFER_SIZE: int = 50
+    ADMIN_TOKEN: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -1,6 +1,8 @@
 from sqlmodel import SQLModel, Session, create_engine
 
-engine = create_engine("sqlite:///db/database.db")
+DATABASE_URL = "sqlite:///db/database.db"
+
+engine = create_engine(DATABASE_URL)
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
@@ -0,0 +1,110 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+from config import settings
+from db.db import DATABASE_URL
+
+
+def create_writer_engine(url : str = DATABASE_URL):
+    writer_engine = create_engine(url)
+    if writer_engine.dialect.name == "sqlite":
+        # pysqlite сам управляет транзакциями и ломает SAVEPOINT, поэтому BEGIN
+        # отправляется явно. IMMEDIATE берет RESERVED сразу: отложенный BEGIN держал бы
+        # SHARED во время проверок и при повышении блокировки получал "database is locked"
+        # без ожидания busy timeout, если RESERVED уже у другого соединения
+        @event.listens_for(writer_engine, "connect")
+        def disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(writer_engine, "begin")
+        def begin(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    return writer_engine
+
+
+class GroupCommitWriter:
+    # Единственный поток-писатель: собирает единицы работы, пришедшие в течение окна,
+    # выполняет каждую в своем SAVEPOINT и фиксирует всю пачку одним коммитом.
+    # Ошибка одной единицы откатывает только ее SAVEPOINT и возвращается ее вызывающему
+    def __init__(self, writer_engine, window_ms : float, max_batch : int):
+        self.engine = writer_engine
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, unit):
+        # unit(session) не коммитит сам и возвращает уже готовые данные для ответа:
+        # после общего коммита объекты сессии становятся недоступны
+        future = Future()
+        self._start()
+        self._queue.put((unit, future))
+        return future.result()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        done = []
+        try:
+            with Session(self.engine) as session:
+                for unit, future in batch:
+                    savepoint = session.begin_nested()
+                    try:
+                        result = unit(session)
+                        savepoint.commit()
+                        done.append((future, result, None))
+                    except Exception as e:
+                        savepoint.rollback()
+                        done.append((future, None, e))
+                session.commit()
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result, error in done:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+writer = None
+if settings.GROUP_COMMIT:
+    writer = GroupCommitWriter(create_writer_engine(), settings.GROUP_COMMIT_WINDOW_MS, settings.GROUP_COMMIT_MAX_BATCH)
+
+
+def commit_unit(unit, db : Session):
+    # Выполнить единицу работы и зафиксировать ее: через общий писатель,
+    # если включен GROUP_COMMIT, иначе отдельным коммитом в сессии запроса
+    if writer:
+        return writer.submit(unit)
+
+    result = unit(db)
+    db.commit()
+    return result
@@ -1,10 +1,14 @@
 from fastapi import FastAPI
 
 from db.db import create_db_and_tables
-from routers import games, users, genres, platforms, orders, reviews
+from profiling.sampler import ProfilerMiddleware, profiler
+from routers import games, users, genres, platforms, orders, reviews, exports, admin
 
 app = FastAPI(title="Game Store API")
 
+# Профилирование медленных запросов включается во время работы через PUT /admin/profiler
+app.add_middleware(ProfilerMiddleware)
+
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
@@ -14,4 +18,8 @@ app.include_router(games.router)
 app.include_router(genres.router)
 app.include_router(platforms.router)
 app.include_router(orders.router)
-app.include_router(reviews.router)
\ No newline at end of file
+app.include_router(reviews.router)
+app.include_router(exports.router)
+app.include_router(admin.router)
+
+profiler.instrument(app)
\ No newline at end of file
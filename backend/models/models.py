@@ -92,7 +92,7 @@ class Game(SQLModel, table=True):
         db_game = db.exec(select(Game).where(Game.id == review_game_id)).first()
         avg = db.query(func.avg(Review.rating)).filter(Review.game_id == review_game_id).scalar()
         db_game.rating = round(avg, 1)
-        db.commit()
+        db.flush()
 
 
 # -------------------------GENRE------------------------- #
@@ -205,4 +205,10 @@ class Review(SQLModel, table=True):
         lib = db.exec(select(Library).where((Library.user_id == user_id)&(Library.game_id == game_id))).first()
         if not lib:
             raise HTTPException(status_code=400, detail="Приобретите игру, чтобы оставить отзыв")
-        
\ No newline at end of file
+
+
+# -------------------------BATCH------------------------- #
+def get_many(db : Session, model, ids : List[int]):
+    # Один запрос с IN вместо запроса на каждый id; порядок ids сохраняется
+    rows = {row.id : row for row in db.exec(select(model).where(model.id.in_(ids))).all()}
+    return [rows[i] for i in ids if i in rows], [i for i in ids if i not in rows]
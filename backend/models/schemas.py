@@ -5,6 +5,8 @@ from fastapi import HTTPException
 from pydantic import BaseModel, EmailStr, field_serializer, field_validator
 from sqlmodel import SQLModel
 
+from config import settings
+
 
 # -------------------------USER------------------------- #
 class UserAdd(BaseModel):
@@ -34,6 +36,10 @@ class UserGet(SQLModel):
 class UserUpdate(SQLModel):
     email : EmailStr
 
+class UserBatchGet(SQLModel):
+    items : List[UserGet]
+    missing : List[int]
+
 
 # -------------------------GAME------------------------- #
 class GameAdd(BaseModel):
@@ -73,6 +79,10 @@ class GameGet(SQLModel):
     def serialize_release_date(self, v : date) -> str:
         return v.strftime("%d.%m.%Y")
 
+class GameBatchGet(SQLModel):
+    items : List[GameGet]
+    missing : List[int]
+
 
 class GameUpdate(SQLModel):
     genre_id : int
@@ -155,4 +165,54 @@ class ReviewGet(SQLModel):
     user_id : int
     game_id : int
     rating : int
-    comment : str
\ No newline at end of file
+    comment : str
+
+class ReviewBatchItem(ReviewGet):
+    id : int
+
+class ReviewBatchGet(SQLModel):
+    items : List[ReviewBatchItem]
+    missing : List[int]
+
+
+# -------------------------BATCH------------------------- #
+class BatchIds(BaseModel):
+    ids : List[int]
+
+    @field_validator("ids")
+    def validate_ids(cls, v):
+        if not v:
+            raise HTTPException(status_code=422, detail="Список id не может быть пустым")
+        if len(v) > settings.BATCH_MAX_IDS:
+            raise HTTPException(status_code=422, detail=f"Нельзя запросить больше {settings.BATCH_MAX_IDS} id за раз")
+        return list(dict.fromkeys(v))
+
+
+# -------------------------PROFILER------------------------- #
+class ProfilerSettings(BaseModel):
+    enabled : bool
+    route_pattern : str = "*"
+    sample_rate : float = 1.0
+    threshold_ms : float = 500
+    interval_ms : float = 5
+
+    @field_validator("sample_rate")
+    def validate_sample_rate(cls, v):
+        if v < 0 or v > 1:
+            raise HTTPException(status_code=422, detail="Доля профилируемых запросов должна быть в диапазоне от 0 до 1")
+        return v
+
+    @field_validator("interval_ms")
+    def validate_interval(cls, v):
+        if v < 5:
+            raise HTTPException(status_code=422, detail="Интервал сэмплирования не может быть меньше 5 мс")
+        return v
+
+class ProfileGet(BaseModel):
+    id : str
+    method : str
+    path : str
+    started : datetime
+    duration_ms : float
+    samples : int
+    categories_ms : dict[str, float]
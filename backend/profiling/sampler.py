@@ -0,0 +1,296 @@
+import asyncio
+import fnmatch
+import functools
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+from cache.versions import versions
+from config import settings
+
+# Настройки и профили хранятся на диске, общем для всех воркеров uvicorn
+PROFILER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "profiler")
+
+DEFAULTS = {"enabled" : False, "route_pattern" : "*", "sample_rate" : 1.0, "threshold_ms" : 500.0, "interval_ms" : 5.0}
+
+PROFILE_ID = re.compile(r"^\d+-\d+$")
+
+# Категории времени: первая совпавшая по всему стеку побеждает
+CATEGORIES = (
+    ("hashing", lambda path, name: "passlib" in path or "bcrypt" in path),
+    ("sql", lambda path, name: "sqlalchemy" in path or "sqlite3" in path or "psycopg2" in path),
+    ("serialization", lambda path, name: name in ("serialize_response", "jsonable_encoder")),
+    ("validation", lambda path, name: "pydantic" in path or name in ("solve_dependencies", "request_body_to_args")),
+)
+
+current_session : ContextVar[Optional["ProfileSession"]] = ContextVar("current_profile_session", default=None)
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    path = "/".join(code.co_filename.replace(os.sep, "/").split("/")[-2:])
+    return f"{code.co_name} ({path}:{frame.f_lineno})"
+
+
+def categorize(frames) -> str:
+    for category, match in CATEGORIES:
+        if any(match(frame.f_code.co_filename, frame.f_code.co_name) for frame in frames):
+            return category
+    return "app"
+
+
+class ProfileSession:
+    def __init__(self, method : str, path : str):
+        self.method = method
+        self.path = path
+        self.started = time.time()
+        self.started_perf = time.perf_counter()
+        # ident потока -> кадр-якорь: сэмпл засчитывается, только если якорь есть в стеке потока
+        self.threads = {}
+        self.samples = Counter()
+        self.categories = Counter()
+
+    def sample(self, frames : dict):
+        for ident, anchor in list(self.threads.items()):
+            frame = frames.get(ident)
+            stack = []
+            while frame is not None and frame is not anchor:
+                stack.append(frame)
+                frame = frame.f_back
+            if frame is None or not stack:
+                continue
+
+            stack.reverse()
+            self.samples[tuple(frame_label(f) for f in stack)] += 1
+            self.categories[categorize(stack)] += 1
+
+
+class Profiler:
+    # Сэмплирующий профилировщик запросов: один фоновый поток раз в interval_ms снимает
+    # стеки потоков, занятых профилируемыми запросами. Профили запросов дольше
+    # threshold_ms сохраняются файлами в общий каталог, где хранятся последние buffer_size.
+    #
+    # Настройки лежат в settings.json, а их поколение - в общем mmap-файле версий:
+    # каждый воркер перед запросом сверяет поколение (чтение из памяти) и при
+    # изменении перечитывает файл
+    def __init__(self, buffer_size : int, directory : str = PROFILER_DIR):
+        self.buffer_size = buffer_size
+        self.settings_path = os.path.join(directory, "settings.json")
+        self.profiles_dir = os.path.join(directory, "profiles")
+        os.makedirs(self.profiles_dir, exist_ok=True)
+
+        self.settings = dict(DEFAULTS)
+        self._generation = None
+        # id профиля уникален между воркерами и перезапусками: pid процесса и номер,
+        # начинающийся с времени старта процесса в микросекундах
+        self._seq = itertools.count(time.time_ns() // 1000)
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def configure(self, **values):
+        tmp_path = f"{self.settings_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**DEFAULTS, **values}, f)
+        os.replace(tmp_path, self.settings_path)
+        versions.bump("profiler")
+
+    def sync(self) -> dict:
+        generation = versions.get("profiler")
+        if generation != self._generation:
+            try:
+                with open(self.settings_path) as f:
+                    self.settings = {**DEFAULTS, **json.load(f)}
+            except FileNotFoundError:
+                self.settings = dict(DEFAULTS)
+            self._generation = generation
+        return self.settings
+
+    def start(self, method : str, path : str, anchor) -> Optional[ProfileSession]:
+        config = self.sync()
+        if not config["enabled"] or not fnmatch.fnmatch(path, config["route_pattern"]) or random.random() >= config["sample_rate"]:
+            return None
+
+        session = ProfileSession(method, path)
+        session.threads[threading.get_ident()] = anchor
+        with self._lock:
+            self._active.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return session
+
+    def finish(self, session : ProfileSession):
+        with self._lock:
+            self._active.discard(session)
+
+        duration_ms = (time.perf_counter() - session.started_perf) * 1000
+        if duration_ms < self.settings["threshold_ms"] or not session.samples:
+            return
+
+        profile_id = f"{os.getpid()}-{next(self._seq)}"
+        profile = {
+            "id" : profile_id,
+            "method" : session.method,
+            "path" : session.path,
+            "started" : session.started,
+            "duration_ms" : round(duration_ms, 2),
+            "interval_ms" : self.settings["interval_ms"],
+            "samples" : [[list(stack), count] for stack, count in session.samples.items()],
+            "categories" : dict(session.categories),
+        }
+        tmp_path = os.path.join(self.profiles_dir, f".{profile_id}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(profile, f)
+        os.replace(tmp_path, os.path.join(self.profiles_dir, f"{profile_id}.json"))
+        self._prune()
+
+    def _files(self) -> list:
+        # Файлы профилей от старых к новым
+        files = []
+        for entry in os.scandir(self.profiles_dir):
+            if entry.name.endswith(".json"):
+                try:
+                    files.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    pass
+        return [path for _, path in sorted(files)]
+
+    def _prune(self):
+        files = self._files()
+        for path in files[:max(len(files) - self.buffer_size, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _read(self, path : str) -> Optional[dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def list(self) -> list:
+        return [profile for profile in map(self._read, self._files()) if profile]
+
+    def get(self, profile_id : str) -> Optional[dict]:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        return self._read(os.path.join(self.profiles_dir, f"{profile_id}.json"))
+
+    def clear(self):
+        for path in self._files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def bind(self, call):
+        # Синхронные эндпоинты выполняются в пуле потоков: на время вызова поток
+        # регистрируется в профиле запроса (contextvars переносятся в пул)
+        @functools.wraps(call)
+        def wrapper(*args, **kwargs):
+            session = current_session.get()
+            if session is None:
+                return call(*args, **kwargs)
+
+            ident = threading.get_ident()
+            session.threads[ident] = sys._getframe()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                session.threads.pop(ident, None)
+        return wrapper
+
+    def instrument(self, app):
+        for route in app.routes:
+            if isinstance(route, APIRoute) and not asyncio.iscoroutinefunction(route.dependant.call):
+                route.dependant.call = self.bind(route.dependant.call)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = list(self._active)
+            if not active:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            frames = sys._current_frames()
+            for session in active:
+                session.sample(frames)
+            del frames
+            time.sleep(self.settings["interval_ms"] / 1000)
+
+
+class ProfilerMiddleware:
+    # Чистый ASGI-middleware (не BaseHTTPMiddleware): обработчик запроса выполняется
+    # в той же задаче, поэтому кадр middleware служит якорем в стеке event loop
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        session = profiler.start(scope["method"], scope["path"], sys._getframe())
+        if session is None:
+            return await self.app(scope, receive, send)
+
+        token = current_session.set(session)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_session.reset(token)
+            await run_in_threadpool(profiler.finish, session)
+
+
+def to_collapsed(profile : dict) -> str:
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in profile["samples"])
+
+
+def to_speedscope(profile : dict) -> dict:
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in profile["samples"]:
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name" : label})
+        samples.append([index[label] for label in stack])
+        weights.append(count * profile["interval_ms"])
+
+    name = f"{profile['method']} {profile['path']} ({profile['duration_ms']} ms)"
+    return {
+        "$schema" : "https://www.speedscope.app/file-format-schema.json",
+        "shared" : {"frames" : frames},
+        "profiles" : [{
+            "type" : "sampled",
+            "name" : name,
+            "unit" : "milliseconds",
+            "startValue" : 0,
+            "endValue" : sum(weights),
+            "samples" : samples,
+            "weights" : weights,
+        }],
+        "name" : name,
+        "activeProfileIndex" : 0,
+        "exporter" : "game-store-api",
+    }
+
+
+profiler = Profiler(settings.PROFILER_BUFFER_SIZE)
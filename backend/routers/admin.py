@@ -0,0 +1,58 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from auth.security import require_admin
+from models.schemas import ProfileGet, ProfilerSettings
+from profiling.sampler import profiler, to_collapsed, to_speedscope
+
+router = APIRouter(prefix="/admin/profiler", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+def get_profile(profile_id : str) -> dict:
+    profile = profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Профиль не найден")
+    return profile
+
+
+@router.get("", response_model=ProfilerSettings, summary="Получить настройки профилировщика")
+def get_profiler_settings():
+    return ProfilerSettings(**profiler.sync())
+
+
+@router.put("", summary="Изменить настройки профилировщика")
+def edit_profiler_settings(update : ProfilerSettings):
+    profiler.configure(**update.model_dump())
+    return {"message" : "Настройки профилировщика обновлены"}
+
+
+@router.get("/profiles", response_model=List[ProfileGet], summary="Получить список сохраненных профилей медленных запросов")
+def get_all_profiles():
+    return [ProfileGet(id=p["id"],
+                       method=p["method"],
+                       path=p["path"],
+                       started=p["started"],
+                       duration_ms=p["duration_ms"],
+                       samples=sum(count for _, count in p["samples"]),
+                       categories_ms={k : v * p["interval_ms"] for k, v in p["categories"].items()})
+            for p in profiler.list()]
+
+
+@router.get("/profiles/{profile_id}/collapsed", summary="Скачать профиль в формате collapsed stacks")
+def get_profile_collapsed(profile_id : str):
+    return PlainTextResponse(to_collapsed(get_profile(profile_id)),
+                             headers={"Content-Disposition" : f'attachment; filename="profile-{profile_id}.collapsed.txt"'})
+
+
+@router.get("/profiles/{profile_id}/speedscope", summary="Скачать профиль в формате speedscope")
+def get_profile_speedscope(profile_id : str):
+    return JSONResponse(to_speedscope(get_profile(profile_id)),
+                        headers={"Content-Disposition" : f'attachment; filename="profile-{profile_id}.speedscope.json"'})
+
+
+@router.delete("/profiles", summary="Удалить все сохраненные профили")
+def delete_profiles():
+    profiler.clear()
+    return {"message" : "Профили удалены"}
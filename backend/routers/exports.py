@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import logging
+import time
+import zlib
+from datetime import date, datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_
+from sqlmodel import Session, select
+
+from db.db import engine
+from models.models import Library, Order, Review
+
+router = APIRouter(prefix="/export", tags=["Export"])
+logger = logging.getLogger(__name__)
+
+# Сколько строк читается из БД одной страницей и пишется в ответ за один раз
+CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {"csv" : "text/csv; charset=utf-8", "ndjson" : "application/x-ndjson"}
+
+
+def parse_date(v : Optional[str]) -> Optional[date]:
+    if v is None:
+        return None
+    try:
+        return datetime.strptime(v, "%d.%m.%Y").date()
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Дата должна быть в формате дд.мм.гггг")
+
+
+def encode_value(v):
+    if isinstance(v, date):
+        return v.strftime("%d.%m.%Y")
+    return v
+
+
+def after(keys : list, last : tuple):
+    # (k1, k2, ...) > (v1, v2, ...) без row values, чтобы работало на любой БД
+    condition = keys[-1] > last[-1]
+    for key, value in zip(reversed(keys[:-1]), reversed(last[:-1])):
+        condition = or_(key > value, and_(key == value, condition))
+    return condition
+
+
+def stream_rows(name : str, statement, keys : list, columns : list, fmt : str, compress : bool):
+    # Строки читаются кортежами, без создания ORM-объектов, страницами по ключу
+    # (WHERE key > :last ORDER BY key LIMIT n). Каждая страница читается в своей короткой
+    # сессии, поэтому медленное скачивание не держит блокировку чтения SQLite и не мешает
+    # записи. Ключевые столбцы должны идти первыми в statement
+    encoder = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(columns)
+
+    def drain():
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return encoder.compress(data) if encoder else data
+
+    rows = 0
+    last = None
+    started = time.perf_counter()
+    while True:
+        page = statement if last is None else statement.where(after(keys, last))
+        with Session(engine) as session:
+            result = session.exec(page.order_by(*keys).limit(CHUNK_ROWS)).all()
+
+        for row in result:
+            values = [encode_value(v) for v in row]
+            if fmt == "csv":
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False))
+                buffer.write("\n")
+        rows += len(result)
+
+        chunk = drain()
+        if len(result) < CHUNK_ROWS:
+            break
+        if chunk:
+            yield chunk
+        last = tuple(result[-1][:len(keys)])
+
+    if encoder:
+        chunk += encoder.flush()
+    if chunk:
+        yield chunk
+
+    elapsed = time.perf_counter() - started
+    logger.info("export %s: %d rows in %.3fs (%.0f rows/s)", name, rows, elapsed, rows / elapsed if elapsed else 0)
+
+
+def export_response(name : str, statement, keys : list, columns : list, fmt : str, compress : bool):
+    filename = f"{name}.{fmt}" + (".gz" if compress else "")
+    return StreamingResponse(
+        stream_rows(name, statement, keys, columns, fmt, compress),
+        media_type="application/gzip" if compress else MEDIA_TYPES[fmt],
+        headers={"Content-Disposition" : f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/orders", summary="Выгрузить покупки в CSV/NDJSON")
+def export_orders(fmt : Literal["csv", "ndjson"] = Query("csv", alias="format"),
+                  gzip : bool = False,
+                  date_from : Optional[str] = Query(None, description="дд.мм.гггг"),
+                  date_to : Optional[str] = Query(None, description="дд.мм.гггг"),
+                  user_id : Optional[int] = None,
+                  game_id : Optional[int] = None):
+    start, end = parse_date(date_from), parse_date(date_to)
+    columns = ["id", "user_id", "game_id", "game_price", "purchase_date"]
+
+    statement = select(Order.id, Order.user_id, Order.game_id, Order.game_price, Order.purchase_date)
+    if start:
+        statement = statement.where(Order.purchase_date >= start)
+    if end:
+        statement = statement.where(Order.purchase_date <= end)
+    if user_id is not None:
+        statement = statement.where(Order.user_id == user_id)
+    if game_id is not None:
+        statement = statement.where(Order.game_id == game_id)
+
+    return export_response("orders", statement, [Order.id], columns, fmt, gzip)
+
+
+@router.get("/reviews", summary="Выгрузить отзывы в CSV/NDJSON")
+def export_reviews(fmt : Literal["csv", "ndjson"] = Query("csv", alias="format"),
+                   gzip : bool = False,
+                   user_id : Optional[int] = None,
+                   game_id : Optional[int] = None):
+    columns = ["id", "user_id", "game_id", "rating", "comment"]
+
+    statement = select(Review.id, Review.user_id, Review.game_id, Review.rating, Review.comment)
+    if user_id is not None:
+        statement = statement.where(Review.user_id == user_id)
+    if game_id is not None:
+        statement = statement.where(Review.game_id == game_id)
+
+    return export_response("reviews", statement, [Review.id], columns, fmt, gzip)
+
+
+@router.get("/library", summary="Выгрузить библиотеки пользователей в CSV/NDJSON")
+def export_library(fmt : Literal["csv", "ndjson"] = Query("csv", alias="format"),
+                   gzip : bool = False,
+                   user_id : Optional[int] = None,
+                   game_id : Optional[int] = None):
+    columns = ["user_id", "game_id"]
+
+    statement = select(Library.user_id, Library.game_id)
+    if user_id is not None:
+        statement = statement.where(Library.user_id == user_id)
+    if game_id is not None:
+        statement = statement.where(Library.game_id == game_id)
+
+    return export_response("library", statement, [Library.user_id, Library.game_id], columns, fmt, gzip)
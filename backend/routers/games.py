@@ -1,11 +1,13 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlmodel import Session, select
 
+from cache.http import PUBLIC, check_not_modified, make_etag
+from cache.versions import cache, versions
 from db.db import get_session
-from models.models import Game
-from models.schemas import GameAdd, GameGet, GameUpdate
+from models.models import Game, get_many
+from models.schemas import BatchIds, GameAdd, GameBatchGet, GameGet, GameUpdate
 
 router = APIRouter(prefix="/games", tags=["Game"])
 
@@ -18,12 +20,23 @@ def add_game(game : GameAdd, db : Session = Depends(get_session)):
     db.add(db_game)
     db.commit()
     db.refresh(db_game)
+    versions.bump("game")
     return {"message" : f"Игра <{db_game.title}> добавлена"}
 
 
 @router.get("/", response_model=List[GameGet], summary="Получить список всех игр")
-def get_all_games(db : Session = Depends(get_session)):
-    return db.exec(select(Game)).all()
+def get_all_games(request : Request, response : Response, db : Session = Depends(get_session)):
+    not_modified = check_not_modified(request, response, make_etag(["game"]), PUBLIC)
+    if not_modified:
+        return not_modified
+
+    return cache.get("games", ["game"], lambda: [GameGet.model_validate(g) for g in db.exec(select(Game)).all()])
+
+
+@router.post("/batch", response_model=GameBatchGet, summary="Получить информацию о нескольких играх по списку id")
+def get_games_batch(batch : BatchIds, db : Session = Depends(get_session)):
+    items, missing = get_many(db, Game, batch.ids)
+    return {"items" : items, "missing" : missing}
 
 
 @router.get("/{game_id}", response_model=GameGet, summary="Получить информацию об игре")
@@ -54,6 +67,7 @@ def edit_game(game_id : int, update : GameUpdate, db : Session = Depends(get_ses
 
     db.add(db_game)
     db.commit()
+    versions.bump("game")
     return {"message" : "Данные обновлены"}
 
 
@@ -64,4 +78,5 @@ def delete_game(game_id : int, db: Session = Depends(get_session)):
     db_game = db.exec(select(Game).where(Game.id == game_id)).first()
     db.delete(db_game)
     db.commit()
+    versions.bump("game", "order", "review", "library")
     return {"message" : "Игра удалена"}
\ No newline at end of file
@@ -1,8 +1,10 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlmodel import Session, select
 
+from cache.http import PUBLIC, check_not_modified, make_etag
+from cache.versions import cache, versions
 from db.db import get_session
 from models.models import Genre
 from models.schemas import GenreAdd, GenreGet, GenreUpdate
@@ -17,12 +19,17 @@ def add_genre(genre : GenreAdd, db : Session = Depends(get_session)):
     db.add(db_genre)
     db.commit()
     db.refresh(db_genre)
+    versions.bump("genre")
     return {"message" : f"Жанр <{db_genre.name}> добавлен"}
 
 
 @router.get("/", response_model=List[GenreGet], summary="Получить список всех жанров")
-def get_all_genres(db : Session = Depends(get_session)):
-    return db.exec(select(Genre)).all()
+def get_all_genres(request : Request, response : Response, db : Session = Depends(get_session)):
+    not_modified = check_not_modified(request, response, make_etag(["genre"]), PUBLIC)
+    if not_modified:
+        return not_modified
+
+    return cache.get("genres", ["genre"], lambda: [GenreGet.model_validate(g) for g in db.exec(select(Genre)).all()])
 
 
 @router.put("/{genre_id}", summary="Изменить имя жанра")
@@ -35,6 +42,7 @@ def edit_genre(genre_id : int, update : GenreUpdate, db : Session = Depends(get_
 
     db.add(db_genre)
     db.commit()
+    versions.bump("genre")
     return {"message" : "Имя жанра изменено"}
 
 
@@ -45,4 +53,5 @@ def delete_genre(genre_id : int, db : Session = Depends(get_session)):
     db_genre = db.exec(select(Genre).where(Genre.id == genre_id)).first()
     db.delete(db_genre)
     db.commit()
+    versions.bump("genre", "game")
     return {"message" : "Жанр удален"}
\ No newline at end of file
@@ -1,16 +1,18 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlmodel import Session, select
 
+from cache.http import PRIVATE, check_not_modified, make_etag
+from cache.versions import versions
 from db.db import get_session
+from db.writer import commit_unit
 from models.models import Order, Library, Game
 from models.schemas import OrderAdd, OrderGet
 
 router = APIRouter(prefix="/orders", tags=["Order"])
 
-@router.post("", summary="Купить игру")
-def add_order(order : OrderAdd, db : Session = Depends(get_session)):
+def place_order(order : OrderAdd, db : Session):
     Order.check_user_exist(db, order.user_id)
     Order.check_game_exist(db, order.game_id)
     Order.check_in_library(db, order.user_id, order.game_id)
@@ -21,20 +23,30 @@ def add_order(order : OrderAdd, db : Session = Depends(get_session)):
 
     db.add(db_order)
     db.add(db_library)
-    db.commit()
 
     return {"message": "Игра куплена и добавлена в вашу библиотеку",
                 "game_title" : db_game.title,
                 "game_price" : db_game.price}
 
 
+@router.post("", summary="Купить игру")
+def add_order(order : OrderAdd, db : Session = Depends(get_session)):
+    result = commit_unit(lambda session: place_order(order, session), db)
+    versions.bump("order", "library", key=order.user_id)
+    return result
+
+
 @router.get("/", response_model=List[OrderGet], summary="Получить список всех покупок")
 def get_all_purcashed_games(db : Session = Depends(get_session)):
     return db.exec(select(Order)).all()
 
 
 @router.get("/{user_id}", response_model=list[OrderGet], summary="Получить список покупок конкретного пользователя")
-def get_order_by_user_id(user_id : int, db : Session = Depends(get_session)):
+def get_order_by_user_id(user_id : int, request : Request, response : Response, db : Session = Depends(get_session)):
+    not_modified = check_not_modified(request, response, make_etag(["order"], user_id), PRIVATE)
+    if not_modified:
+        return not_modified
+
     Order.check_user_exist(db, user_id)
     return db.exec(select(Order).where(Order.user_id == user_id)).all()
 
@@ -51,4 +63,5 @@ def delete_order(user_id : int, game_id : int, db : Session = Depends(get_sessio
     db.delete(db_order)
     db.delete(db_library)
     db.commit()
+    versions.bump("order", "library", key=user_id)
     return {"message" : "Вы успешно вернули игру"}
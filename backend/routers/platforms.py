@@ -1,8 +1,10 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlmodel import Session, select
 
+from cache.http import PUBLIC, check_not_modified, make_etag
+from cache.versions import cache, versions
 from db.db import get_session
 from models.models import Platform
 from models.schemas import PlatformAdd, PlatformGet, PlatformUpdate
@@ -17,12 +19,17 @@ def add_platform(platform : PlatformAdd, db : Session = Depends(get_session)):
     db.add(db_platform)
     db.commit()
     db.refresh(db_platform)
+    versions.bump("platform")
     return {"message" : f"Платформа <{db_platform.name}> добавлена"}
 
 
 @router.get("/", response_model=List[PlatformGet], summary="Получить список всех платформ")
-def get_all_platforms(db : Session = Depends(get_session)):
-    return db.exec(select(Platform)).all()
+def get_all_platforms(request : Request, response : Response, db : Session = Depends(get_session)):
+    not_modified = check_not_modified(request, response, make_etag(["platform"]), PUBLIC)
+    if not_modified:
+        return not_modified
+
+    return cache.get("platforms", ["platform"], lambda: [PlatformGet.model_validate(p) for p in db.exec(select(Platform)).all()])
 
 
 @router.put("/{platform_id}", summary="Изменить имя платформы")
@@ -35,6 +42,7 @@ def edit_paltform(platform_id : int, update : PlatformUpdate, db : Session = Dep
 
     db.add(db_platform)
     db.commit()
+    versions.bump("platform")
     return {"message" : "Имя платформы изменено"}
 
 
@@ -45,4 +53,5 @@ def delete_platform(platform_id : int, db : Session = Depends(get_session)):
     db_platform = db.exec(select(Platform).where(Platform.id == platform_id)).first()
     db.delete(db_platform)
     db.commit()
+    versions.bump("platform", "game")
     return {"message" : "Платформа удалена"}
\ No newline at end of file
@@ -4,14 +4,15 @@ from fastapi import APIRouter, Depends
 from sqlmodel import Session, select
 from sqlalchemy import func
 
+from cache.versions import versions
 from db.db import get_session
-from models.models import Review, Game
-from models.schemas import ReviewAdd, ReviewGet
+from db.writer import commit_unit
+from models.models import Review, Game, get_many
+from models.schemas import BatchIds, ReviewAdd, ReviewBatchGet, ReviewGet
 
 router = APIRouter(prefix="/reviews", tags=["Review"])
 
-@router.post("", summary="Оставить отзыв игре")
-def add_review(review : ReviewAdd, db : Session = Depends(get_session)):
+def place_review(review : ReviewAdd, db : Session):
     Review.check_user_exist(db, review.user_id)
     Review.check_game_exist(db, review.game_id)
     Review.check_already_exist(db, review.user_id, review.game_id)
@@ -19,17 +20,30 @@ def add_review(review : ReviewAdd, db : Session = Depends(get_session)):
 
     db_review = Review(**review.model_dump())
     db.add(db_review)
-    db.commit()
-    db.refresh(db_review)
+    db.flush()
     Game.calculate_rating(db, db_review.game_id)
     return {"message" : f"Комментарий к игре <{db_review.game.title}> успешно оставлен"}
 
 
+@router.post("", summary="Оставить отзыв игре")
+def add_review(review : ReviewAdd, db : Session = Depends(get_session)):
+    result = commit_unit(lambda session: place_review(review, session), db)
+    versions.bump("review", key=review.user_id)
+    versions.bump("game")
+    return result
+
+
 @router.get("/", response_model=List[ReviewGet], summary="Получить список всех отзывов")
 def get_all_reviews(db : Session = Depends(get_session)):
     return db.exec(select(Review)).all()
 
 
+@router.post("/batch", response_model=ReviewBatchGet, summary="Получить несколько отзывов по списку id")
+def get_reviews_batch(batch : BatchIds, db : Session = Depends(get_session)):
+    items, missing = get_many(db, Review, batch.ids)
+    return {"items" : items, "missing" : missing}
+
+
 @router.get("/user/{user_id}", response_model=List[ReviewGet], summary="Получить список отзывов пользователя")
 def get_reviews_by_id(user_id : int, db : Session = Depends(get_session)):
     Review.check_user_exist(db, user_id)
@@ -52,4 +66,5 @@ def delete_review(game_id : int, user_id : int, db : Session = Depends(get_sessi
     db_review = db.exec(select(Review).where((Review.user_id == user_id)&(Review.game_id == game_id))).first()
     db.delete(db_review)
     db.commit()
+    versions.bump("review", key=user_id)
     return {"message" : "Отзыв удален"}
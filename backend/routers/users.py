@@ -1,11 +1,13 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlmodel import Session, select
 
+from cache.http import PRIVATE, check_not_modified, make_etag
+from cache.versions import versions
 from db.db import get_session
-from models.models import User, Library
-from models.schemas import UserAdd, UserLogin, UserGet, UserUpdate, Token
+from models.models import User, Library, get_many
+from models.schemas import BatchIds, UserAdd, UserLogin, UserGet, UserBatchGet, UserUpdate, Token
 from auth.service import AuthService
 
 router = APIRouter(prefix="/users", tags=["User"])
@@ -14,6 +16,7 @@ router = APIRouter(prefix="/users", tags=["User"])
 @router.post("/register", response_model=Token, summary="Зарегистрироваться")
 def register_user(data: UserAdd, session: Session = Depends(get_session)):
     token = AuthService.register(data, session)
+    versions.bump("user")
     return Token(access_token=token)
 
 
@@ -28,6 +31,12 @@ def get_all_users(db : Session = Depends(get_session)):
     return db.exec(select(User)).all()
 
 
+@router.post("/batch", response_model=UserBatchGet, summary="Получить информацию о нескольких пользователях по списку id")
+def get_users_batch(batch : BatchIds, db : Session = Depends(get_session)):
+    items, missing = get_many(db, User, batch.ids)
+    return {"items" : items, "missing" : missing}
+
+
 @router.get("/{user_id}", response_model=UserGet, summary="Получить информацию о пользователе")
 def get_user_by_id(user_id : int, db : Session = Depends(get_session)):
     User.check_exist(db, user_id)
@@ -36,7 +45,11 @@ def get_user_by_id(user_id : int, db : Session = Depends(get_session)):
 
 
 @router.get("/{user_id}/library", summary="Получить список всех игр из библиотеки пользователя")
-def get_library_games(user_id : int, db : Session = Depends(get_session)):
+def get_library_games(user_id : int, request : Request, response : Response, db : Session = Depends(get_session)):
+    not_modified = check_not_modified(request, response, make_etag(["library"], user_id), PRIVATE)
+    if not_modified:
+        return not_modified
+
     User.check_exist(db, user_id)
 
     db_lib_games = db.exec(select(Library).where(Library.user_id == user_id)).all()                  #-----------------------------------------
@@ -53,6 +66,7 @@ def edit_user(user_id : int, update : UserUpdate, db : Session = Depends(get_ses
 
     db.add(db_user)
     db.commit()
+    versions.bump("user")
     return {"message" : "Данные обновлены"}
 
 
@@ -63,4 +77,6 @@ def delete_user(user_id : int, db : Session = Depends(get_session)):
     db_user = db.exec(select(User).where(User.id == user_id)).first()
     db.delete(db_user)
     db.commit()
+    versions.bump("user")
+    versions.bump("order", "review", "library", key=user_id)
     return {"message" : "Пользователь удален"}
\ No newline at end of file